@@ -10,14 +10,25 @@ image = modal.Image.debian_slim(python_version="3.11").pip_install(
     "uvicorn",
     "websockets>=12.0",
     "openai>=1.0",
+    "httpx[http2]",
     "dedalus_labs",
+    "orjson>=3.10",
+    "pybase64",
+    "pillow",
 )
 
-# Copy all backend .py files into the image directly
+# Copy the backend modules into the image directly. Listed explicitly so
+# stray copies or scratch files in the directory never ship.
+BACKEND_MODULES = (
+    "dedalus_agent.py",
+    "orchestrator.py",
+    "prompts.py",
+    "session_logger.py",
+    "tools.py",
+)
 backend_dir = pathlib.Path(__file__).parent
-for py_file in backend_dir.glob("*.py"):
-    if py_file.name != "app.py":
-        image = image.add_local_file(str(py_file), f"/root/{py_file.name}")
+for module in BACKEND_MODULES:
+    image = image.add_local_file(str(backend_dir / module), f"/root/{module}")
 
 
 @app.function(
@@ -31,10 +42,15 @@ def create_app():
 
     sys.path.insert(0, "/root")
 
+    from dedalus_agent import close_clients
     from orchestrator import Orchestrator
 
     web_app = FastAPI(title="First-Aid Coach Backend")
 
+    @web_app.on_event("shutdown")
+    async def shutdown():
+        await close_clients()
+
     @web_app.get("/health")
     async def health():
         return {"status": "ok"}
@@ -6,20 +6,129 @@ client-side, decrypted only inside sealed hardware enclaves).
 Fallback: Direct OpenAI if Dedalus unavailable.
 """
 
+import asyncio
+import io
 import os
+import time
 
+import httpx
+import pybase64
 from dedalus_labs import AsyncDedalus
 from openai import AsyncOpenAI
+from PIL import Image
 
 from prompts import DEDALUS_SCENE_PROMPT
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 DEDALUS_API_KEY = os.environ.get("DEDALUS_API_KEY", "")
 
+# After this many consecutive Dedalus failures, skip it for DEDALUS_COOLDOWN
+# seconds and go straight to OpenAI instead of paying a doomed round trip.
+DEDALUS_MAX_FAILURES = 3
+DEDALUS_COOLDOWN = 60.0
+_dedalus_fail_streak = 0
+_dedalus_open_until = 0.0
+
+# Frames are shrunk to this box before upload so every VLM call costs a
+# roughly fixed number of image tokens regardless of camera resolution.
+FRAME_MAX_SIZE = (512, 512)
+FRAME_JPEG_QUALITY = 70
+
+# Last (source, (preprocessed, dhash)) pair — the scene loop often re-analyzes
+# the same buffered frame, so skip decoding it again.
+_frame_cache: tuple[bytes, tuple[str, int]] | None = None
+
+# Clients are shared across scene analyses so the HTTP/2 connection (and its
+# TLS session) stays alive between calls instead of being rebuilt every time.
+_openai_client: AsyncOpenAI | None = None
+_dedalus_client: AsyncDedalus | None = None
+
+
+def _new_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=4),
+    )
+
+
+def _get_openai() -> AsyncOpenAI:
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            http_client=_new_http_client(),
+        )
+    return _openai_client
+
+
+def _get_dedalus() -> AsyncDedalus:
+    global _dedalus_client
+    if _dedalus_client is None:
+        _dedalus_client = AsyncDedalus(
+            api_key=DEDALUS_API_KEY,
+            http_client=_new_http_client(),
+        )
+    return _dedalus_client
+
+
+async def close_clients():
+    """Close the shared VLM clients. Call once when the app shuts down."""
+    global _openai_client, _dedalus_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+    if _dedalus_client is not None:
+        await _dedalus_client.close()
+        _dedalus_client = None
+
+
+def _dhash(image: Image.Image) -> int:
+    """64-bit difference hash: brightness gradients on a 9x8 grayscale grid."""
+    pixels = list(image.convert("L").resize((9, 8), Image.BILINEAR).getdata())
+    h = 0
+    for row in range(8):
+        for col in range(8):
+            i = row * 9 + col
+            h = (h << 1) | (pixels[i] > pixels[i + 1])
+    return h
+
+
+def _preprocess_frame(frame_jpeg: bytes) -> tuple[str, int]:
+    """
+    Decode a JPEG, downscale it to FRAME_MAX_SIZE and re-encode.
+    Returns the new JPEG as base64 and a perceptual hash of the frame.
+    """
+    global _frame_cache
+    # Sessions share this cache from worker threads; read it once so another
+    # thread can't swap in its frame between the identity check and the return.
+    cached = _frame_cache
+    if cached is not None and cached[0] is frame_jpeg:
+        return cached[1]
+
+    image = Image.open(io.BytesIO(frame_jpeg))
+    image = image.convert("RGB")
+    image.thumbnail(FRAME_MAX_SIZE, Image.BILINEAR)
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=FRAME_JPEG_QUALITY)
+    result = (pybase64.b64encode_as_string(buf.getbuffer()), _dhash(image))
+
+    _frame_cache = (frame_jpeg, result)
+    return result
+
+
+async def preprocess_frame(frame_jpeg: bytes) -> tuple[str, int]:
+    """Run _preprocess_frame in a worker thread so decoding doesn't block the loop."""
+    return await asyncio.to_thread(_preprocess_frame, frame_jpeg)
+
+
+# Static parts of every scene request, built once at import.
+_SYSTEM_MESSAGE = {"role": "system", "content": DEDALUS_SCENE_PROMPT}
+_IMAGE_URL_PREFIX = "data:image/jpeg;base64,"
+
 
 def _build_messages(frame_b64: str, context: str) -> list[dict]:
     return [
-        {"role": "system", "content": DEDALUS_SCENE_PROMPT},
+        _SYSTEM_MESSAGE,
         {
             "role": "user",
             "content": [
@@ -27,7 +136,7 @@ def _build_messages(frame_b64: str, context: str) -> list[dict]:
                 {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/jpeg;base64,{frame_b64}",
+                        "url": _IMAGE_URL_PREFIX + frame_b64,
                         "detail": "low",
                     },
                 },
@@ -42,41 +151,46 @@ async def analyze_scene(
     recent_transcript: str,
 ) -> str | None:
     """
-    Analyze a camera frame. Returns a factual scene description (1-2 sentences).
+    Analyze a camera frame (already passed through preprocess_frame).
+    Returns a factual scene description (1-2 sentences).
     """
     context = f"Current scenario: {scenario_state}."
     if recent_transcript:
         context += f" User just said: {recent_transcript}"
 
-    # Primary: Dedalus (DAuth credential isolation)
-    if DEDALUS_API_KEY:
-        result = await _analyze_with_dedalus(frame_b64, context)
+    for analyze in _ANALYZERS:
+        result = await analyze(frame_b64, context)
         if result:
             return result
-
-    # Fallback: direct OpenAI
-    return await _analyze_with_openai(frame_b64, context)
+    return None
 
 
 async def _analyze_with_dedalus(frame_b64: str, context: str) -> str | None:
+    global _dedalus_fail_streak, _dedalus_open_until
+    if time.monotonic() < _dedalus_open_until:
+        return None
     try:
-        client = AsyncDedalus(api_key=DEDALUS_API_KEY)
-        response = await client.chat.completions.create(
+        response = await _get_dedalus().chat.completions.create(
             model="openai/gpt-4o",
             messages=_build_messages(frame_b64, context),
             max_tokens=100,
         )
         print("[VLM] Dedalus call succeeded")
+        _dedalus_fail_streak = 0
         return response.choices[0].message.content
     except Exception as e:
         print(f"[VLM] Dedalus error: {e}")
+        _dedalus_fail_streak += 1
+        if _dedalus_fail_streak >= DEDALUS_MAX_FAILURES:
+            print(f"[VLM] Dedalus failing, skipping it for {DEDALUS_COOLDOWN:.0f}s")
+            _dedalus_open_until = time.monotonic() + DEDALUS_COOLDOWN
+            _dedalus_fail_streak = 0
         return None
 
 
 async def _analyze_with_openai(frame_b64: str, context: str) -> str | None:
     try:
-        client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-        response = await client.chat.completions.create(
+        response = await _get_openai().chat.completions.create(
             model="gpt-4o",
             messages=_build_messages(frame_b64, context),
             max_tokens=100,
@@ -86,3 +200,12 @@ async def _analyze_with_openai(frame_b64: str, context: str) -> str | None:
     except Exception as e:
         print(f"[VLM] OpenAI error: {e}")
         return None
+
+
+# Provider chain, decided once at import.
+# Primary: Dedalus (DAuth credential isolation). Fallback: direct OpenAI.
+_ANALYZERS = (
+    (_analyze_with_dedalus, _analyze_with_openai)
+    if DEDALUS_API_KEY
+    else (_analyze_with_openai,)
+)
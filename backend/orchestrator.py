@@ -1,43 +1,134 @@
 """
 Core orchestrator: bridges iOS client <-> OpenAI Realtime <-> scene analysis.
 
-Four concurrent loops:
+Three concurrent loops:
 1. ios_to_realtime    — audio/frames from iOS → Realtime + frame buffer
 2. realtime_to_ios    — Realtime events → audio/transcripts/tools to iOS
-3. scene_loop         — periodic VLM analysis → inject into Realtime (secondary)
-4. follow_up_loop     — proactive check-ins when user goes quiet during active scenario
+3. timer_loop         — 1s tick driving:
+   - scene analysis   — periodic VLM analysis → held for the next user turn (secondary)
+   - follow-ups       — proactive check-ins when user goes quiet during active scenario
 """
 
 import asyncio
 import json
 import os
+import re
 import time
 import traceback
 import uuid
+from collections import deque
 
+import orjson
+import pybase64
 import websockets
 
-from dedalus_agent import analyze_scene
+from dedalus_agent import analyze_scene, preprocess_frame
 from prompts import REALTIME_SYSTEM_PROMPT
-from tools import REALTIME_TOOLS
+from tools import REALTIME_TOOLS_JSON
 from session_logger import SessionLogger
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 REALTIME_URL = "wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-12-17"
 SCENE_ANALYSIS_INTERVAL = 8.0
+SCENE_START_DELAY = 3.0
+FOLLOW_UP_CHECK_INTERVAL = 5.0
+TIMER_TICK = 1.0
+# Pause scene analysis for SCENE_BREAKER_COOLDOWN seconds after this many
+# consecutive failed VLM calls, so a stalled provider isn't hammered.
+SCENE_MAX_FAILURES = 3
+SCENE_BREAKER_COOLDOWN = 60.0
+# Frames whose dHash differs from the last analyzed frame by fewer bits than
+# this are treated as the same scene and not sent to the VLM.
+FRAME_HASH_THRESHOLD = 8
+# Scene analysis only ever looks at the latest frame, so anything faster than
+# this is dropped on arrival. iOS samples a frame every 3s today; this only
+# guards against a client that streams faster. The interval is a little under
+# 1 / MAX_FRAME_RATE_HZ so network jitter doesn't drop correctly paced frames.
+MAX_FRAME_RATE_HZ = 2
+MIN_FRAME_INTERVAL = 0.4
+# Binary WebSocket messages to and from iOS carry a one-byte type tag followed
+# by raw payload bytes, so audio and frames skip the JSON + base64 wrapping.
+AUDIO_TAG = b"\x01"
+FRAME_TAG = b"\x02"
+# input_audio_buffer.append is spliced around the base64 audio, which never
+# needs JSON escaping, instead of serializing a dict per chunk.
+_AUDIO_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_AUDIO_APPEND_SUFFIX = '"}'
+# Observations sharing at least this fraction of their words (Jaccard) with
+# one of the last SCENE_DEDUP_WINDOW observations are treated as repeats.
+SCENE_DEDUP_WINDOW = 5
+SCENE_DEDUP_SIMILARITY = 0.75
+# Max queued session-log calls applied per drain pass
+LOG_BATCH_SIZE = 256
+
+# Session config is static, so serialize it once instead of per connection.
+SESSION_UPDATE = orjson.dumps(
+    {
+        "type": "session.update",
+        "session": {
+            "modalities": ["text", "audio"],
+            "instructions": REALTIME_SYSTEM_PROMPT,
+            "voice": "alloy",
+            "input_audio_format": "pcm16",
+            "output_audio_format": "pcm16",
+            "input_audio_transcription": {"model": "whisper-1"},
+            "turn_detection": {
+                "type": "server_vad",
+                "threshold": 0.5,
+                "prefix_padding_ms": 300,
+                "silence_duration_ms": 700,
+            },
+            "tools": orjson.Fragment(REALTIME_TOOLS_JSON),
+            "tool_choice": "auto",
+        },
+    }
+).decode()
+
+# Follow-up prompts per scenario state, escalating with each unanswered check-in.
+_FOLLOWUP_BASE = "[FOLLOW UP] The user has been quiet for {elapsed}."
+FOLLOWUP_TEMPLATES: dict[str, tuple[str, ...]] = {
+    "CPR": (
+        f"{_FOLLOWUP_BASE} They're doing CPR. Give a brief word of encouragement or ask if they need to switch.",
+        f"{_FOLLOWUP_BASE} Check if they're still doing compressions and if someone else can take over.",
+        f"{_FOLLOWUP_BASE} Ask if help has arrived or if they need anything.",
+    ),
+    "BLEEDING": (
+        f"{_FOLLOWUP_BASE} They're applying pressure to a wound. Ask if the bleeding is slowing down.",
+        f"{_FOLLOWUP_BASE} Check if they're still applying pressure and if help is on the way.",
+        f"{_FOLLOWUP_BASE} Ask if the situation has changed.",
+    ),
+    "CHOKING": (
+        f"{_FOLLOWUP_BASE} They're helping someone who was choking. Ask if the obstruction cleared.",
+        f"{_FOLLOWUP_BASE} Check if the person can breathe now.",
+        f"{_FOLLOWUP_BASE} Ask if the situation has changed.",
+    ),
+}
+_DEFAULT_FOLLOWUPS = (
+    f"{_FOLLOWUP_BASE} Check in briefly — ask if they need help with anything.",
+)
 
 
 class Orchestrator:
     def __init__(self, ios_ws):
         self.ios_ws = ios_ws
         self.rt_ws = None
-        self.latest_frame_b64: str | None = None
+        self.latest_frame_jpeg: bytes | None = None
+        self._last_frame_recv_t = 0.0
         self.recent_user_transcript = ""
         self.scenario_state = "NONE"
         self.scenario_severity = "minor"
         self._shutdown = False
         self._response_in_progress = False
-        self._last_scene_observation = ""
+        self._recent_obs_tokens: deque[frozenset[str]] = deque(maxlen=SCENE_DEDUP_WINDOW)
+        # Latest scene observation not yet shown to the model; it rides along
+        # with the next user turn or follow-up instead of its own message.
+        self._pending_scene_obs: str | None = None
+        self._last_frame_phash: int | None = None
+        self._scene_task: asyncio.Task | None = None
+        # At most one VLM call in flight, even if a call outlasts the interval
+        self._vlm_sem = asyncio.Semaphore(1)
+        self._scene_fail_streak = 0
+        self._scene_open_until = 0.0
 
         # Timing state for proactive follow-ups
         self._last_user_speech_time = time.time()
@@ -47,11 +138,19 @@ class Orchestrator:
         # Session logging
         session_id = str(uuid.uuid4())
         self.session_logger = SessionLogger(session_id)
-        self._current_assistant_text = ""  # Track current assistant response
+        # Log calls are queued from the hot loops and applied by _log_drain_loop
+        self._log_q: asyncio.Queue = asyncio.Queue()
+        self._log_task: asyncio.Task | None = None
+        self._current_assistant_chunks: list[str] = []  # Track current assistant response
 
     async def run(self):
+        # permessage-deflate would burn CPU compressing every base64 audio
+        # chunk on the event loop; trade the bandwidth for latency instead.
         self.rt_ws = await websockets.connect(
             REALTIME_URL,
+            compression=None,
+            max_size=2**24,
+            ping_interval=20,
             additional_headers={
                 "Authorization": f"Bearer {OPENAI_API_KEY}",
                 "OpenAI-Beta": "realtime=v1",
@@ -60,11 +159,11 @@ class Orchestrator:
         print("[Orchestrator] Connected to OpenAI Realtime")
         await self._configure_session()
 
+        self._log_task = asyncio.create_task(self._log_drain_loop())
         await asyncio.gather(
             self._ios_to_realtime_loop(),
             self._realtime_to_ios_loop(),
-            self._scene_analysis_loop(),
-            self._follow_up_loop(),
+            self._timer_loop(),
             return_exceptions=True,
         )
 
@@ -72,38 +171,23 @@ class Orchestrator:
         self._shutdown = True
         if self.rt_ws:
             await self.rt_ws.close()
-        
+        if self._scene_task:
+            self._scene_task.cancel()
+        if self._log_task:
+            self._log_task.cancel()
+
         # Save session logs
         try:
+            self._apply_log_batch(self._take_log_batch(self._log_q.qsize()))
             self.session_logger.save_session_log()
             self.session_logger.generate_ems_report()
         except Exception as e:
             print(f"[Orchestrator] Error saving session logs: {e}")
+        finally:
+            self.session_logger.close()
 
     async def _configure_session(self):
-        await self.rt_ws.send(
-            json.dumps(
-                {
-                    "type": "session.update",
-                    "session": {
-                        "modalities": ["text", "audio"],
-                        "instructions": REALTIME_SYSTEM_PROMPT,
-                        "voice": "alloy",
-                        "input_audio_format": "pcm16",
-                        "output_audio_format": "pcm16",
-                        "input_audio_transcription": {"model": "whisper-1"},
-                        "turn_detection": {
-                            "type": "server_vad",
-                            "threshold": 0.5,
-                            "prefix_padding_ms": 300,
-                            "silence_duration_ms": 700,
-                        },
-                        "tools": REALTIME_TOOLS,
-                        "tool_choice": "auto",
-                    },
-                }
-            )
-        )
+        await self.rt_ws.send(SESSION_UPDATE)
         print("[Orchestrator] Session configured")
 
     # ── Loop 1: iOS → Realtime ─────────────────────────────────────────
@@ -111,26 +195,51 @@ class Orchestrator:
     async def _ios_to_realtime_loop(self):
         try:
             while not self._shutdown:
-                raw = await self.ios_ws.receive_text()
-                msg = json.loads(raw)
+                message = await self.ios_ws.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+
+                data = message.get("bytes")
+                if data is not None:
+                    # Empty or unknown-tag messages are ignored
+                    tag = data[:1]
+                    if tag == AUDIO_TAG:
+                        audio_b64 = pybase64.b64encode_as_string(memoryview(data)[1:])
+                        await self.rt_ws.send(
+                            _AUDIO_APPEND_PREFIX + audio_b64 + _AUDIO_APPEND_SUFFIX
+                        )
+                    elif tag == FRAME_TAG and self._accept_frame():
+                        self.latest_frame_jpeg = data[1:]
+                    continue
+
+                # JSON text messages (older clients)
+                msg = orjson.loads(message["text"])
                 msg_type = msg.get("type")
 
                 if msg_type == "audio":
                     await self.rt_ws.send(
-                        json.dumps(
+                        orjson.dumps(
                             {
                                 "type": "input_audio_buffer.append",
                                 "audio": msg["data"],
                             }
-                        )
+                        ).decode()
                     )
-                elif msg_type == "frame":
-                    self.latest_frame_b64 = msg["data"]
+                elif msg_type == "frame" and self._accept_frame():
+                    self.latest_frame_jpeg = pybase64.b64decode(msg["data"])
 
         except Exception as e:
             if not self._shutdown:
                 print(f"[iOS→RT] Error: {e}")
 
+    def _accept_frame(self) -> bool:
+        """Rate-limit incoming frames to MAX_FRAME_RATE_HZ."""
+        now = time.time()
+        if now - self._last_frame_recv_t < MIN_FRAME_INTERVAL:
+            return False
+        self._last_frame_recv_t = now
+        return True
+
     # ── Loop 2: Realtime → iOS ─────────────────────────────────────────
 
     async def _realtime_to_ios_loop(self):
@@ -139,12 +248,12 @@ class Orchestrator:
                 if self._shutdown:
                     break
 
-                event = json.loads(raw)
+                event = orjson.loads(raw)
                 event_type = event.get("type", "")
 
                 if event_type == "response.audio.delta":
-                    await self._send_ios(
-                        {"type": "audio", "data": event.get("delta", "")}
+                    await self._send_ios_bytes(
+                        AUDIO_TAG + pybase64.b64decode(event.get("delta", ""))
                     )
 
                 elif event_type == "response.created":
@@ -156,16 +265,17 @@ class Orchestrator:
 
                 elif event_type == "response.audio_transcript.delta":
                     delta = event.get("delta", "")
-                    self._current_assistant_text += delta
-                    self.session_logger.log_assistant_transcript(delta, is_delta=True)
+                    self._current_assistant_chunks.append(delta)
+                    self._log("log_assistant_transcript", delta, True)
                     await self._send_ios(
                         {"type": "transcript", "role": "assistant", "delta": delta}
                     )
 
                 elif event_type == "response.audio_transcript.done":
-                    if self._current_assistant_text:
-                        self.session_logger.log_assistant_transcript(self._current_assistant_text, is_delta=False)
-                        self._current_assistant_text = ""
+                    if self._current_assistant_chunks:
+                        text = "".join(self._current_assistant_chunks)
+                        self._current_assistant_chunks.clear()
+                        self._log("log_assistant_transcript", text, False)
                     await self._send_ios(
                         {"type": "transcript_done", "role": "assistant"}
                     )
@@ -178,7 +288,7 @@ class Orchestrator:
                     self.recent_user_transcript = text
                     self._last_user_speech_time = time.time()
                     self._follow_up_count = 0  # Reset — user is engaged
-                    self.session_logger.log_user_transcript(text)
+                    self._log("log_user_transcript", text)
                     await self._send_ios(
                         {"type": "transcript", "role": "user", "text": text}
                     )
@@ -187,8 +297,13 @@ class Orchestrator:
                     self._response_in_progress = False
                     self._last_user_speech_time = time.time()
                     self._follow_up_count = 0
-                    self._current_assistant_text = ""  # Reset assistant text on interrupt
+                    self._current_assistant_chunks.clear()  # Reset assistant text on interrupt
+                    # Interrupt iOS playback first so barge-in isn't held up
+                    # by the scene injection write
                     await self._send_ios({"type": "interrupt"})
+                    scene_prefix = self._take_pending_scene()
+                    if scene_prefix:
+                        await self._inject_user_text(scene_prefix.rstrip("\n"))
 
                 elif event_type == "response.output_item.done":
                     item = event.get("item", {})
@@ -208,66 +323,100 @@ class Orchestrator:
                 print(f"[RT→iOS] Error: {e}")
                 traceback.print_exc()
 
-    # ── Loop 3: Scene Analysis ─────────────────────────────────────────
+    # ── Loop 3: Timers ─────────────────────────────────────────────────
 
-    async def _scene_analysis_loop(self):
-        await asyncio.sleep(3.0)
+    async def _timer_loop(self):
+        """
+        One tick drives both periodic jobs, scheduled by elapsed loop time.
+        Neither fires while a response is being generated. Scene analysis
+        runs as its own task so a slow VLM call doesn't delay follow-ups.
+        """
+        loop = asyncio.get_running_loop()
+        next_scene = loop.time() + SCENE_START_DELAY + SCENE_ANALYSIS_INTERVAL
+        next_follow_up = loop.time() + FOLLOW_UP_CHECK_INTERVAL
         try:
             while not self._shutdown:
-                await asyncio.sleep(SCENE_ANALYSIS_INTERVAL)
-
-                if not self.latest_frame_b64:
-                    continue
+                await asyncio.sleep(TIMER_TICK)
                 if self._response_in_progress:
                     continue
 
+                now = loop.time()
+                if now >= next_scene:
+                    next_scene = now + SCENE_ANALYSIS_INTERVAL
+                    if (
+                        not self._vlm_sem.locked()
+                        and time.time() >= self._scene_open_until
+                    ):
+                        self._scene_task = asyncio.create_task(self._run_scene_analysis())
+                if now >= next_follow_up:
+                    next_follow_up = now + FOLLOW_UP_CHECK_INTERVAL
+                    await self._check_follow_up()
+
+        except asyncio.CancelledError:
+            pass
+
+    # ── Scene Analysis ─────────────────────────────────────────────────
+
+    async def _run_scene_analysis(self):
+        async with self._vlm_sem:
+            if not self.latest_frame_jpeg:
+                return
+
+            try:
+                frame_b64, frame_phash = await preprocess_frame(self.latest_frame_jpeg)
+                if (
+                    self._last_frame_phash is not None
+                    and bin(frame_phash ^ self._last_frame_phash).count("1")
+                    < FRAME_HASH_THRESHOLD
+                ):
+                    return
+                self._last_frame_phash = frame_phash
+
                 try:
                     observation = await analyze_scene(
-                        frame_b64=self.latest_frame_b64,
+                        frame_b64=frame_b64,
                         scenario_state=self.scenario_state,
                         recent_transcript=self.recent_user_transcript,
                     )
-                    if not observation:
-                        continue
-                    if self._is_similar(observation, self._last_scene_observation):
-                        continue
-
-                    self._last_scene_observation = observation
-                    self.session_logger.log_scene_observation(observation)
-
-                    await self.rt_ws.send(
-                        json.dumps(
-                            {
-                                "type": "conversation.item.create",
-                                "item": {
-                                    "type": "message",
-                                    "role": "user",
-                                    "content": [
-                                        {
-                                            "type": "input_text",
-                                            "text": f"[SCENE UPDATE] {observation}",
-                                        }
-                                    ],
-                                },
-                            }
-                        )
-                    )
-                    # Don't auto-trigger response — voice drives the conversation
-
-                    await self._send_ios(
-                        {"type": "scene_update", "observation": observation}
-                    )
-                    print(f"[Scene] {observation[:80]}...")
+                except Exception:
+                    self._record_scene_result(False)
+                    raise
+                self._record_scene_result(observation is not None)
+                if not observation:
+                    return
+                obs_tokens = frozenset(re.findall(r"\w+", observation.lower()))
+                if self._is_similar(obs_tokens):
+                    return
+
+                self._recent_obs_tokens.append(obs_tokens)
+                self._log("log_scene_observation", observation)
+
+                # Held until the user next speaks or a follow-up fires —
+                # voice drives the conversation
+                self._pending_scene_obs = observation
+
+                await self._send_ios(
+                    {"type": "scene_update", "observation": observation}
+                )
+                print(f"[Scene] {observation[:80]}...")
 
-                except Exception as e:
-                    print(f"[Scene] Error: {e}")
+            except Exception as e:
+                print(f"[Scene] Error: {e}")
 
-        except asyncio.CancelledError:
-            pass
+    def _record_scene_result(self, ok: bool):
+        if ok:
+            self._scene_fail_streak = 0
+            return
+        self._last_frame_phash = None  # Retry this frame even if the scene holds still
+        self._scene_fail_streak += 1
+        if self._scene_fail_streak >= SCENE_MAX_FAILURES:
+            print(f"[Scene] {self._scene_fail_streak} failures, pausing for {SCENE_BREAKER_COOLDOWN:.0f}s")
+            self._scene_open_until = time.time() + SCENE_BREAKER_COOLDOWN
+            self._scene_fail_streak = 0
 
-    # ── Loop 4: Proactive Follow-ups ───────────────────────────────────
+    # ── Proactive Follow-ups ───────────────────────────────────────────
 
-    async def _follow_up_loop(self):
+    async def _check_follow_up(self):
         """
         When the user goes quiet during an active scenario, nudge the model
         to check in. The model decides what to say based on context.
@@ -278,95 +427,73 @@ class Orchestrator:
         - Max 3 follow-ups without user response, then stop nagging
         - No follow-ups if scenario is NONE (no emergency detected yet)
         """
-        await asyncio.sleep(5.0)
-        try:
-            while not self._shutdown:
-                await asyncio.sleep(5.0)  # Check every 5s
-
-                if self._response_in_progress:
-                    continue
-                # Only follow up during active, non-trivial scenarios
-                inactive = {"NONE", "RESOLVED", "MINOR_INJURY"}
-                if self.scenario_state in inactive:
-                    continue
-                if self.scenario_severity == "minor":
-                    continue
-                if self._follow_up_count >= 3:
-                    continue
-
-                now = time.time()
-                silence_duration = now - self._last_user_speech_time
-                since_agent_spoke = now - self._last_agent_speech_time
-
-                # Determine follow-up threshold
-                threshold = 30.0 if self._follow_up_count == 0 else 45.0
-
-                # Only follow up if enough silence AND agent isn't freshly done talking
-                if silence_duration < threshold:
-                    continue
-                if since_agent_spoke < 15.0:
-                    continue
-
-                # Build context-aware follow-up prompt
-                elapsed_str = f"{int(silence_duration)}s"
-                prompt = self._build_follow_up_prompt(elapsed_str)
-
-                print(f"[Follow-up] {elapsed_str} silence, count={self._follow_up_count}: {prompt[:60]}...")
-
-                await self.rt_ws.send(
-                    json.dumps(
-                        {
-                            "type": "conversation.item.create",
-                            "item": {
-                                "type": "message",
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "input_text",
-                                        "text": prompt,
-                                    }
-                                ],
-                            },
-                        }
-                    )
-                )
-                await self.rt_ws.send(json.dumps({"type": "response.create"}))
+        # Only follow up during active, non-trivial scenarios
+        inactive = {"NONE", "RESOLVED", "MINOR_INJURY"}
+        if self.scenario_state in inactive:
+            return
+        if self.scenario_severity == "minor":
+            return
+        if self._follow_up_count >= 3:
+            return
+
+        now = time.time()
+        silence_duration = now - self._last_user_speech_time
+        since_agent_spoke = now - self._last_agent_speech_time
+
+        # Determine follow-up threshold
+        threshold = 30.0 if self._follow_up_count == 0 else 45.0
+
+        # Only follow up if enough silence AND agent isn't freshly done talking
+        if silence_duration < threshold:
+            return
+        if since_agent_spoke < 15.0:
+            return
+
+        # Build context-aware follow-up prompt
+        elapsed_str = f"{int(silence_duration)}s"
+        prompt = self._build_follow_up_prompt(elapsed_str)
+
+        print(f"[Follow-up] {elapsed_str} silence, count={self._follow_up_count}: {prompt[:60]}...")
+
+        await self._inject_user_text(self._take_pending_scene() + prompt)
+        await self.rt_ws.send(json.dumps({"type": "response.create"}))
 
-                self._follow_up_count += 1
-                self._last_agent_speech_time = now  # Prevent rapid re-triggers
-
-        except asyncio.CancelledError:
-            pass
+        self._follow_up_count += 1
+        self._last_agent_speech_time = now  # Prevent rapid re-triggers
 
     def _build_follow_up_prompt(self, elapsed: str) -> str:
         """Build a context-aware follow-up injection based on scenario state."""
-        base = f"[FOLLOW UP] The user has been quiet for {elapsed}."
-
-        if self.scenario_state == "CPR":
-            prompts = [
-                f"{base} They're doing CPR. Give a brief word of encouragement or ask if they need to switch.",
-                f"{base} Check if they're still doing compressions and if someone else can take over.",
-                f"{base} Ask if help has arrived or if they need anything.",
-            ]
-        elif self.scenario_state == "BLEEDING":
-            prompts = [
-                f"{base} They're applying pressure to a wound. Ask if the bleeding is slowing down.",
-                f"{base} Check if they're still applying pressure and if help is on the way.",
-                f"{base} Ask if the situation has changed.",
-            ]
-        elif self.scenario_state == "CHOKING":
-            prompts = [
-                f"{base} They're helping someone who was choking. Ask if the obstruction cleared.",
-                f"{base} Check if the person can breathe now.",
-                f"{base} Ask if the situation has changed.",
-            ]
-        else:
-            prompts = [
-                f"{base} Check in briefly — ask if they need help with anything.",
-            ]
-
-        idx = min(self._follow_up_count, len(prompts) - 1)
-        return prompts[idx]
+        templates = FOLLOWUP_TEMPLATES.get(self.scenario_state, _DEFAULT_FOLLOWUPS)
+        idx = min(self._follow_up_count, len(templates) - 1)
+        return templates[idx].format(elapsed=elapsed)
+
+    # ── Session Log Queue ───────────────────────────────────────────────
+
+    def _log(self, method: str, *args):
+        """Queue a SessionLogger call instead of running it inline."""
+        self._log_q.put_nowait((method, args))
+
+    def _take_log_batch(self, limit: int) -> list[tuple[str, tuple]]:
+        batch = []
+        while len(batch) < limit and not self._log_q.empty():
+            batch.append(self._log_q.get_nowait())
+        return batch
+
+    def _apply_log_batch(self, batch: list[tuple[str, tuple]]):
+        for method, args in batch:
+            try:
+                getattr(self.session_logger, method)(*args)
+            except Exception as e:
+                print(f"[Orchestrator] Session log error in {method}: {e}")
+
+    async def _log_drain_loop(self):
+        try:
+            while True:
+                first = await self._log_q.get()
+                batch = [first] + self._take_log_batch(LOG_BATCH_SIZE - 1)
+                self._apply_log_batch(batch)
+        except asyncio.CancelledError:
+            pass
 
     # ── Tool Call Handling ──────────────────────────────────────────────
 
@@ -390,46 +517,82 @@ class Orchestrator:
             body_region = args.get("body_region", "")
             self.scenario_state = scenario.upper()
             self.scenario_severity = severity
-            self.session_logger.log_scenario_update(scenario, severity, summary, body_region)
+            self._log("log_scenario_update", scenario, severity, summary, body_region)
             print(f"[Scenario] {scenario} ({severity}): {summary} [region: {body_region}]")
             # Notify iOS for potential UI display + wireframe animation
-            await self._send_ios({
+            ios_msg = {
                 "type": "scenario_update",
                 "scenario": scenario,
                 "severity": severity,
                 "summary": summary,
                 "body_region": body_region,
-            })
+            }
         else:
             # All other tools go to iOS for local execution
-            self.session_logger.log_tool_call(name, args)
-            await self._send_ios({"type": "tool", "name": name, "params": args})
+            self._log("log_tool_call", name, args)
+            ios_msg = {"type": "tool", "name": name, "params": args}
+
+        # iOS notification and the Realtime tool output go out on different
+        # sockets and don't depend on each other — send them concurrently.
+        await asyncio.gather(
+            self._send_ios(ios_msg),
+            self.rt_ws.send(
+                json.dumps(
+                    {
+                        "type": "conversation.item.create",
+                        "item": {
+                            "type": "function_call_output",
+                            "call_id": call_id,
+                            "output": json.dumps({"status": "ok"}),
+                        },
+                    }
+                )
+            ),
+        )
+
+        self._response_in_progress = False
+        await self.rt_ws.send(json.dumps({"type": "response.create"}))
+
+    # ── Helpers ─────────────────────────────────────────────────────────
 
+    def _take_pending_scene(self) -> str:
+        """Return the buffered scene update as a message prefix and clear it."""
+        if not self._pending_scene_obs:
+            return ""
+        prefix = f"[SCENE UPDATE] {self._pending_scene_obs}\n"
+        self._pending_scene_obs = None
+        return prefix
+
+    async def _inject_user_text(self, text: str):
         await self.rt_ws.send(
             json.dumps(
                 {
                     "type": "conversation.item.create",
                     "item": {
-                        "type": "function_call_output",
-                        "call_id": call_id,
-                        "output": json.dumps({"status": "ok"}),
+                        "type": "message",
+                        "role": "user",
+                        "content": [{"type": "input_text", "text": text}],
                     },
                 }
             )
         )
 
-        self._response_in_progress = False
-        await self.rt_ws.send(json.dumps({"type": "response.create"}))
-
-    # ── Helpers ─────────────────────────────────────────────────────────
-
-    def _is_similar(self, new: str, old: str) -> bool:
-        if not old:
-            return False
-        return new[:50].lower().strip() == old[:50].lower().strip()
+    def _is_similar(self, tokens: frozenset[str]) -> bool:
+        """True if the word set nearly matches one of the recent observations."""
+        for prev in self._recent_obs_tokens:
+            union = len(tokens | prev)
+            if union and len(tokens & prev) / union >= SCENE_DEDUP_SIMILARITY:
+                return True
+        return False
 
     async def _send_ios(self, data: dict):
         try:
-            await self.ios_ws.send_json(data)
+            await self.ios_ws.send_text(orjson.dumps(data).decode())
+        except Exception:
+            pass
+
+    async def _send_ios_bytes(self, data: bytes):
+        try:
+            await self.ios_ws.send_bytes(data)
         except Exception:
             pass
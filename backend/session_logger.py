@@ -6,28 +6,84 @@ import json
 import os
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional
 
+import orjson
+
+# Tool-call params are interned only when small and scalar-only, like
+# start_metronome(bpm=110), and the table stops growing at _INTERN_MAX entries.
+_INTERN_SCALARS = (str, int, float, bool, type(None))
+_INTERN_MAX_KEYS = 4
+_INTERN_MAX = 256
+
+
+def _now() -> tuple[float, datetime]:
+    """Read the clock once (time_ns); return it as a Unix timestamp and a local datetime."""
+    ts = time.time_ns() / 1e9
+    return ts, datetime.fromtimestamp(ts)
+
+
+def _hms(dt: datetime) -> str:
+    """HH:MM:SS without going through strftime's locale machinery."""
+    return f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+
+@lru_cache(maxsize=4096)
+def _fmt_hms(ts: int) -> str:
+    """HH:MM:SS for a whole-second timestamp; cached across report rebuilds."""
+    return _hms(datetime.fromtimestamp(ts))
+
 
 class TranscriptEntry:
-    def __init__(self, timestamp: float, role: str, text: str):
+    __slots__ = ("timestamp", "dt", "role", "_text", "_delta_buf")
+
+    def __init__(self, timestamp: float, role: str, text: str, dt: Optional[datetime] = None):
         self.timestamp = timestamp
+        self.dt = dt or datetime.fromtimestamp(timestamp)
         self.role = role  # "user" or "assistant"
-        self.text = text
+        self._text = text
+        self._delta_buf: Optional[List[str]] = None
+
+    @property
+    def text(self) -> str:
+        if self._delta_buf is not None:
+            self._text = "".join(self._delta_buf)
+            self._delta_buf = None
+        return self._text
+
+    def append(self, delta: str):
+        """Append a streamed delta; pieces are joined on the next read of text."""
+        if self._delta_buf is None:
+            self._delta_buf = [self._text]
+        self._delta_buf.append(delta)
 
     def to_dict(self) -> dict:
         return {
             "timestamp": self.timestamp,
-            "datetime": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "datetime": self.dt,
             "role": self.role,
             "text": self.text,
         }
 
 
 class SessionLogger:
-    def __init__(self, session_id: str):
+    """
+    Events are appended to <session_id>_events.ndjson in output_dir
+    (default ./session_logs) as they are logged. save_session_log() only
+    writes a small summary, next to it unless given another directory.
+
+    With keep_in_memory=False the event lists stay empty and the EMS report
+    is built by reading the NDJSON back. Streamed assistant deltas are never
+    written to disk, so that report lists each assistant turn once, while the
+    in-memory one also has the entry built up from the deltas.
+    """
+
+    def __init__(self, session_id: str, output_dir: Optional[str] = None, keep_in_memory: bool = True):
         self.session_id = session_id
+        self.output_dir = output_dir
+        self.keep_in_memory = keep_in_memory
         self.start_time = datetime.now()
         self.transcript_entries: List[TranscriptEntry] = []
         self.scene_observations: List[Dict] = []
@@ -40,31 +96,52 @@ class SessionLogger:
         self.current_summary = ""
         self.current_body_region = ""
 
+        # Events/default output dir, resolved and created on first use
+        self._default_output_dir: Optional[str] = None
+        self._events_path: Optional[str] = None
+        self._sink = None  # Opened on the first logged event
+
+        # (tool, typed params items) -> shared (params, params_json); repeated
+        # calls like start_metronome(bpm=110) reuse one dict and one string
+        self._params_intern: Dict[tuple, tuple[dict, str]] = {}
+
     def log_user_transcript(self, text: str):
         """Log a user transcript entry."""
-        entry = TranscriptEntry(time.time(), "user", text)
-        self.transcript_entries.append(entry)
+        ts, dt = _now()
+        entry = TranscriptEntry(ts, "user", text, dt)
+        if self.keep_in_memory:
+            self.transcript_entries.append(entry)
+        self._write_event("transcript", entry.to_dict())
         print(f"[SessionLogger] User: {text[:50]}...")
 
     def log_assistant_transcript(self, text: str, is_delta: bool = False):
         """Log an assistant transcript entry."""
+        if is_delta and not self.keep_in_memory:
+            return  # Deltas only feed the in-memory entry; disk gets the full turn
         if is_delta and self.transcript_entries and self.transcript_entries[-1].role == "assistant":
             # Append to last entry if it's a delta
-            self.transcript_entries[-1].text += text
-        else:
-            entry = TranscriptEntry(time.time(), "assistant", text)
+            self.transcript_entries[-1].append(text)
+            return
+        ts, dt = _now()
+        entry = TranscriptEntry(ts, "assistant", text, dt)
+        if self.keep_in_memory:
             self.transcript_entries.append(entry)
         if not is_delta:
+            # Only completed turns go to disk; deltas would just be noise
+            self._write_event("transcript", entry.to_dict())
             print(f"[SessionLogger] Assistant: {text[:50]}...")
 
     def log_scene_observation(self, observation: str):
         """Log a scene observation."""
+        ts, dt = _now()
         entry = {
-            "timestamp": time.time(),
-            "datetime": datetime.now().isoformat(),
+            "timestamp": ts,
+            "datetime": dt,
             "observation": observation,
         }
-        self.scene_observations.append(entry)
+        if self.keep_in_memory:
+            self.scene_observations.append(entry)
+        self._write_event("scene_observation", entry)
 
     def log_scenario_update(self, scenario: str, severity: str, summary: str, body_region: str):
         """Log a scenario update."""
@@ -73,42 +150,117 @@ class SessionLogger:
         self.current_summary = summary
         self.current_body_region = body_region
         
+        ts, dt = _now()
         entry = {
-            "timestamp": time.time(),
-            "datetime": datetime.now().isoformat(),
+            "timestamp": ts,
+            "datetime": dt,
             "scenario": scenario,
             "severity": severity,
             "summary": summary,
             "body_region": body_region,
         }
-        self.scenario_updates.append(entry)
+        if self.keep_in_memory:
+            self.scenario_updates.append(entry)
+        self._write_event("scenario_update", entry)
 
     def log_tool_call(self, tool_name: str, params: dict):
         """Log a tool call."""
-        entry = {
-            "timestamp": time.time(),
-            "datetime": datetime.now().isoformat(),
+        ts, dt = _now()
+        record = {
+            "timestamp": ts,
+            "datetime": dt,
             "tool": tool_name,
             "params": params,
         }
-        self.tool_calls.append(entry)
+        self._write_event("tool_call", record)
+        if self.keep_in_memory:
+            params, params_json = self._intern_params(tool_name, params)
+            # Serialized once here so report rebuilds don't re-encode it; the
+            # NDJSON only carries the structured params
+            self.tool_calls.append({**record, "params": params, "params_json": params_json})
+
+    def _intern_params(self, tool_name: str, params: dict) -> tuple[dict, str]:
+        """Return a shared (params, JSON) pair for small scalar params seen before."""
+        if len(params) > _INTERN_MAX_KEYS or not all(
+            type(v) in _INTERN_SCALARS for v in params.values()
+        ):
+            # e.g. show_ui item lists: serialized as-is, never kept in the table
+            return params, json.dumps(params)
+        # Value types are part of the key since 1, 1.0 and True compare equal
+        # but serialize differently; item order is kept so the JSON matches.
+        key = (tool_name, tuple((k, type(v), v) for k, v in params.items()))
+        cached = self._params_intern.get(key)
+        if cached is None:
+            # Copy so the caller's dict isn't shared; the copy must not be mutated
+            cached = (dict(params), json.dumps(params))
+            if len(self._params_intern) < _INTERN_MAX:
+                self._params_intern[key] = cached
+        return cached
+
+    def _write_event(self, kind: str, record: dict):
+        """Append one event to the NDJSON sink."""
+        if self._sink is None:
+            self._events_path = os.path.join(
+                self._resolve_output(None), f"{self.session_id}_events.ndjson"
+            )
+            self._sink = open(self._events_path, "ab", buffering=1 << 20)
+        self._sink.write(orjson.dumps({"kind": kind, **record}) + b"\n")
+
+    def _load_events(self) -> tuple[List[TranscriptEntry], List[Dict], List[Dict]]:
+        """Read transcript, scene and tool-call events back from the NDJSON sink."""
+        transcript, scenes, tools = [], [], []
+        if self._events_path is None:
+            return transcript, scenes, tools
+        if self._sink is not None:
+            self._sink.flush()
+        with open(self._events_path, "rb") as f:
+            for line in f:
+                event = orjson.loads(line)
+                kind = event["kind"]
+                if kind == "transcript":
+                    transcript.append(TranscriptEntry(event["timestamp"], event["role"], event["text"]))
+                elif kind == "scene_observation":
+                    scenes.append(event)
+                elif kind == "tool_call":
+                    event["params_json"] = json.dumps(event["params"])
+                    tools.append(event)
+        return transcript, scenes, tools
+
+    def close(self):
+        """Flush and close the NDJSON sink."""
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def _resolve_output(self, output_dir: Optional[str]) -> str:
+        """Return output_dir, creating it if needed; defaults to self.output_dir or ./session_logs."""
+        if output_dir is not None:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            return output_dir
+        if self._default_output_dir is None:
+            default = self.output_dir or os.path.join(os.getcwd(), "session_logs")
+            Path(default).mkdir(parents=True, exist_ok=True)
+            self._default_output_dir = default
+        return self._default_output_dir
 
     def save_session_log(self, output_dir: Optional[str] = None) -> str:
-        """Save session log as JSON file."""
-        if output_dir is None:
-            output_dir = os.path.join(os.getcwd(), "session_logs")
-        
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        """
+        Save the session summary as a JSON file. The events NDJSON always
+        stays in the logger's own output_dir; events_file points at it.
+        """
+        output_dir = self._resolve_output(output_dir)
         
+        if self._sink is not None:
+            self._sink.flush()
+
+        # Events are already on disk in the NDJSON file; this is just the summary
+        end_time = datetime.now()
         log_data = {
             "session_id": self.session_id,
-            "start_time": self.start_time.isoformat(),
-            "end_time": datetime.now().isoformat(),
-            "duration_seconds": (datetime.now() - self.start_time).total_seconds(),
-            "transcript_entries": [e.to_dict() for e in self.transcript_entries],
-            "scene_observations": self.scene_observations,
-            "scenario_updates": self.scenario_updates,
-            "tool_calls": self.tool_calls,
+            "start_time": self.start_time,
+            "end_time": end_time,
+            "duration_seconds": (end_time - self.start_time).total_seconds(),
+            "events_file": self._events_path,
             "current_scenario": {
                 "scenario": self.current_scenario,
                 "severity": self.current_severity,
@@ -116,111 +268,98 @@ class SessionLogger:
                 "body_region": self.current_body_region,
             },
         }
-        
+
         filename = f"{self.session_id}_session_log.json"
         filepath = os.path.join(output_dir, filename)
         
-        with open(filepath, "w") as f:
-            json.dump(log_data, f, indent=2)
+        # orjson serializes the datetime values natively
+        with open(filepath, "wb") as f:
+            f.write(orjson.dumps(log_data, option=orjson.OPT_INDENT_2))
         
         print(f"[SessionLogger] Saved session log to {filepath}")
         return filepath
 
     def generate_ems_report(self, output_dir: Optional[str] = None) -> str:
         """Generate EMS-ready text report."""
-        if output_dir is None:
-            output_dir = os.path.join(os.getcwd(), "session_logs")
-        
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-        
-        report_lines = [
-            "=" * 50,
-            "EMS READY REPORT - FIRST AID SESSION",
-            "=" * 50,
-            "",
-            "SESSION INFORMATION",
-            "-" * 50,
-            f"Session ID: {self.session_id}",
-            f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}",
-            f"End Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Duration: {(datetime.now() - self.start_time).total_seconds():.1f} seconds",
-            "",
-        ]
-        
-        if self.current_scenario != "none":
-            report_lines.extend([
-                "SCENARIO DETAILS",
-                "-" * 50,
-                f"Type: {self.current_scenario.upper()}",
-                f"Severity: {self.current_severity.upper()}",
-                f"Body Region: {self.current_body_region}",
-                f"Summary: {self.current_summary}",
-                "",
-            ])
-        
-        if self.scene_observations:
-            report_lines.extend([
-                "SCENE OBSERVATIONS",
-                "-" * 50,
-            ])
-            for i, obs in enumerate(self.scene_observations, 1):
-                dt = datetime.fromisoformat(obs["datetime"])
-                report_lines.append(f"{i}. [{dt.strftime('%H:%M:%S')}] {obs['observation']}")
-            report_lines.append("")
-        
-        report_lines.extend([
-            "CONVERSATION TRANSCRIPT",
-            "-" * 50,
-        ])
-        
-        for entry in self.transcript_entries:
-            dt = datetime.fromtimestamp(entry.timestamp)
-            role = entry.role.upper()
-            report_lines.append(f"[{dt.strftime('%H:%M:%S')}] {role}: {entry.text}")
-            report_lines.append("")
-        
-        report_lines.extend([
-            "",
-            "KEY INFORMATION SUMMARY",
-            "-" * 50,
-        ])
-        
-        user_statements = [e.text for e in self.transcript_entries if e.role == "user"]
-        assistant_instructions = [e.text for e in self.transcript_entries if e.role == "assistant"]
-        
-        report_lines.append(f"User Statements ({len(user_statements)} total):")
-        for statement in user_statements:
-            report_lines.append(f"  • {statement}")
-        
-        report_lines.append("")
-        report_lines.append(f"Assistant Instructions ({len(assistant_instructions)} total):")
-        for instruction in assistant_instructions:
-            report_lines.append(f"  • {instruction}")
-        
-        if self.tool_calls:
-            report_lines.extend([
-                "",
-                "TOOL CALLS",
-                "-" * 50,
-            ])
-            for call in self.tool_calls:
-                dt = datetime.fromisoformat(call["datetime"])
-                report_lines.append(f"[{dt.strftime('%H:%M:%S')}] {call['tool']}: {json.dumps(call['params'])}")
-        
-        report_lines.extend([
-            "",
-            "=" * 50,
-            "END OF REPORT",
-            "=" * 50,
-        ])
-        
-        report_text = "\n".join(report_lines)
+        output_dir = self._resolve_output(output_dir)
         
+        if self.keep_in_memory:
+            transcript, scenes, tool_calls = (
+                self.transcript_entries,
+                self.scene_observations,
+                self.tool_calls,
+            )
+        else:
+            transcript, scenes, tool_calls = self._load_events()
+
+        end_time = datetime.now()
         filename = f"{self.session_id}_EMS_Report.txt"
         filepath = os.path.join(output_dir, filename)
-        
-        with open(filepath, "w") as f:
-            f.write(report_text)
-        
+
+        # Stream straight into a large write buffer instead of building a
+        # list of lines and joining it into one big string first.
+        with open(filepath, "w", buffering=1 << 20) as f:
+            w = f.write
+            w(
+                f"{'=' * 50}\n"
+                "EMS READY REPORT - FIRST AID SESSION\n"
+                f"{'=' * 50}\n"
+                "\n"
+                "SESSION INFORMATION\n"
+                f"{'-' * 50}\n"
+                f"Session ID: {self.session_id}\n"
+                f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"End Time: {end_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                f"Duration: {(end_time - self.start_time).total_seconds():.1f} seconds\n"
+                "\n"
+            )
+
+            if self.current_scenario != "none":
+                w(
+                    "SCENARIO DETAILS\n"
+                    f"{'-' * 50}\n"
+                    f"Type: {self.current_scenario.upper()}\n"
+                    f"Severity: {self.current_severity.upper()}\n"
+                    f"Body Region: {self.current_body_region}\n"
+                    f"Summary: {self.current_summary}\n"
+                    "\n"
+                )
+
+            if scenes:
+                w(f"SCENE OBSERVATIONS\n{'-' * 50}\n")
+                for i, obs in enumerate(scenes, 1):
+                    hms = _fmt_hms(int(obs["timestamp"]))
+                    w(f"{i}. [{hms}] {obs['observation']}\n")
+                w("\n")
+
+            w(f"CONVERSATION TRANSCRIPT\n{'-' * 50}\n")
+            for entry in transcript:
+                hms = _fmt_hms(int(entry.timestamp))
+                w(f"[{hms}] {entry.role.upper()}: {entry.text}\n\n")
+
+            w(f"\nKEY INFORMATION SUMMARY\n{'-' * 50}\n")
+
+            # One pass over the transcript; roles are only "user" or "assistant"
+            user_statements, assistant_instructions = [], []
+            ua, aa = user_statements.append, assistant_instructions.append
+            for e in transcript:
+                (ua if e.role == "user" else aa)(e.text)
+
+            w(f"User Statements ({len(user_statements)} total):\n")
+            for statement in user_statements:
+                w(f"  • {statement}\n")
+
+            w(f"\nAssistant Instructions ({len(assistant_instructions)} total):\n")
+            for instruction in assistant_instructions:
+                w(f"  • {instruction}\n")
+
+            if tool_calls:
+                w(f"\nTOOL CALLS\n{'-' * 50}\n")
+                for call in tool_calls:
+                    hms = _fmt_hms(int(call["timestamp"]))
+                    w(f"[{hms}] {call['tool']}: {call['params_json']}\n")
+
+            w(f"\n{'=' * 50}\nEND OF REPORT\n{'=' * 50}")
+
         print(f"[SessionLogger] Generated EMS report: {filepath}")
         return filepath
@@ -2,7 +2,9 @@
 # These are sent via session.update and the model can call them during conversation.
 # When called, the backend routes them as JSON commands to the iOS app.
 
-REALTIME_TOOLS = [
+import orjson
+
+REALTIME_TOOLS = (
     {
         "type": "function",
         "name": "set_scenario",
@@ -136,4 +138,8 @@ REALTIME_TOOLS = [
             "required": ["card_type", "title", "items"],
         },
     },
-]
+)
+
+# The schema is static, so it is serialized once here and spliced into
+# session.update as-is (see orchestrator.SESSION_UPDATE).
+REALTIME_TOOLS_JSON = orjson.dumps(REALTIME_TOOLS)
@@ -23,6 +23,10 @@ class WebSocketManager: ObservableObject {
     private var pingTask: Task<Void, Never>?
     private var receiveTask: Task<Void, Never>?
 
+    /// Type tag (first byte) of binary messages to and from the backend.
+    private static let audioTag: UInt8 = 0x01
+    private static let frameTag: UInt8 = 0x02
+
     // MARK: - Connection
 
     func connect(to urlString: String) {
@@ -70,26 +74,22 @@ class WebSocketManager: ObservableObject {
 
     // MARK: - Sending
 
-    /// Send a raw audio chunk (PCM16 24kHz) as base64.
+    /// Send a raw audio chunk (PCM16 24kHz) as a tagged binary message.
     func sendAudio(_ data: Data) {
-        let b64 = data.base64EncodedString()
-        let msg: [String: Any] = ["type": "audio", "data": b64]
-        sendJSON(msg)
+        sendTagged(Self.audioTag, data)
     }
 
-    /// Send a video frame (JPEG) as base64.
+    /// Send a video frame (JPEG) as a tagged binary message.
     func sendFrame(_ jpegData: Data) {
-        let b64 = jpegData.base64EncodedString()
-        let msg: [String: Any] = ["type": "frame", "data": b64]
-        sendJSON(msg)
+        sendTagged(Self.frameTag, jpegData)
     }
 
-    private func sendJSON(_ dict: [String: Any]) {
-        guard let data = try? JSONSerialization.data(withJSONObject: dict),
-              let text = String(data: data, encoding: .utf8)
-        else { return }
+    private func sendTagged(_ tag: UInt8, _ payload: Data) {
+        var message = Data(capacity: payload.count + 1)
+        message.append(tag)
+        message.append(payload)
 
-        webSocketTask?.send(.string(text)) { error in
+        webSocketTask?.send(.data(message)) { error in
             if let error {
                 NSLog("[WS] Send error: \(error)")
             }
@@ -109,7 +109,10 @@ class WebSocketManager: ObservableObject {
                 case .string(let text):
                     handleMessage(text)
                 case .data(let data):
-                    if let text = String(data: data, encoding: .utf8) {
+                    if data.first == Self.audioTag {
+                        // Raw PCM16 audio from AI — no JSON or base64 to unwrap
+                        onAudioReceived?(Data(data.dropFirst()))
+                    } else if let text = String(data: data, encoding: .utf8) {
                         handleMessage(text)
                     }
                 @unknown default: